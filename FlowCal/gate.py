@@ -24,6 +24,10 @@ import scipy.ndimage.filters
 import skimage.measure
 import collections
 
+# Number of events processed at a time by gates that evaluate channels
+# independently
+_BLOCK_SIZE = 8192
+
 ###
 # Gate Classes
 ###
@@ -101,7 +105,10 @@ def start_end(data, num_start=250, num_end=100, full_output=False):
         # catch the edge case where `num_end=0` causes mask[-num_end:] to mask
         # off all events
         mask[-num_end:] = False
-    gated_data = data[mask]
+
+    # Equivalent to ``data[mask]``, but avoids the slower boolean indexing
+    # code path.
+    gated_data = np.compress(mask, data, axis=0)
 
     if full_output:
         return StartEndGateOutput(gated_data=gated_data, mask=mask)
@@ -150,20 +157,51 @@ def high_low(data, channels=None, high=None, low=None, full_output=False):
     # Default values for high and low
     if high is None:
         if hasattr(data_ch, 'range'):
-            high = [np.Inf if di is None else di[1] for di in data_ch.range()]
+            high = [np.inf if di is None else di[1] for di in data_ch.range()]
             high = np.array(high)
         else:
-            high = np.Inf
+            high = np.inf
     if low is None:
         if hasattr(data_ch, 'range'):
-            low = [-np.Inf if di is None else di[0] for di in data_ch.range()]
+            low = [-np.inf if di is None else di[0] for di in data_ch.range()]
             low = np.array(low)
         else:
-            low = -np.Inf
+            low = -np.inf
 
     # Gate
-    mask = np.all((data_ch < high) & (data_ch > low), axis = 1)
-    gated_data = data[mask]
+    # The mask is accumulated in place one channel at a time, over blocks of
+    # events small enough to stay in cache while all channels are evaluated.
+    # This avoids allocating NxD temporary arrays and reducing them along the
+    # channel axis.
+    data_ch = np.asarray(data_ch)
+    n_events, n_channels = data_ch.shape
+    # Use one threshold per channel. A single threshold applies to all
+    # channels.
+    thresholds = []
+    for name, threshold in (('high', high), ('low', low)):
+        threshold = np.asarray(threshold).ravel()
+        if threshold.size == 1:
+            threshold = np.repeat(threshold, n_channels)
+        elif threshold.size != n_channels:
+            raise ValueError("{0} should have one value or one value per"
+                " channel ({1} values, {2} channels)".format(
+                    name, threshold.size, n_channels))
+        thresholds.append(threshold)
+    high, low = thresholds
+
+    mask = np.ones(n_events, dtype=bool)
+    channel_mask = np.empty(min(n_events, _BLOCK_SIZE), dtype=bool)
+    for start in range(0, n_events, _BLOCK_SIZE):
+        data_block = data_ch[start:start + _BLOCK_SIZE]
+        mask_block = mask[start:start + _BLOCK_SIZE]
+        channel_mask_block = channel_mask[:data_block.shape[0]]
+        for i in range(n_channels):
+            np.less(data_block[:,i], high[i], out=channel_mask_block)
+            mask_block &= channel_mask_block
+            np.greater(data_block[:,i], low[i], out=channel_mask_block)
+            mask_block &= channel_mask_block
+
+    gated_data = np.compress(mask, data, axis=0)
 
     if full_output:
         return HighLowGateOutput(gated_data=gated_data, mask=mask)
@@ -240,7 +278,7 @@ def ellipse(data, channels,
     mask = ((data_rotated[:,0]/a)**2 + (data_rotated[:,1]/b)**2 <= 1)
 
     # Gate
-    data_gated = data[mask]
+    data_gated = np.compress(mask, data, axis=0)
 
     if full_output:
         # Calculate contour
@@ -426,8 +464,7 @@ def density2d(data,
     xe = np.array(xe, dtype=float)
     ye = np.array(ye, dtype=float)
 
-    # Map each event to its histogram bin by sorting events into a 2D array of
-    # lists which mimics the histogram.
+    # Map each event to its histogram bin.
     #
     # Use np.digitize to calculate the histogram bin index for each event
     # given the histogram bin edges. Note that the index returned by
@@ -464,16 +501,6 @@ def density2d(data,
     x_bin_indices = x_bin_indices[~outlier_mask]
     y_bin_indices = y_bin_indices[~outlier_mask]
 
-    # Create a 2D array of lists mimicking the histogram to accumulate events
-    # associated with each bin.
-    filler = np.frompyfunc(lambda x: list(), 1, 1)
-    H_events = np.empty_like(H, dtype=object)
-    filler(H_events, H_events)
-
-    for event_idx, x_bin_idx, y_bin_idx in \
-            zip(event_indices, x_bin_indices, y_bin_indices):
-        H_events[x_bin_idx, y_bin_idx].append(event_idx)
-
     # Create bin mask if necessary
     contours = None
     if bin_mask is None:
@@ -490,7 +517,7 @@ def density2d(data,
         # below
         if n == 0:
             mask = np.zeros(shape=data_ch.shape[0], dtype=bool)
-            gated_data = data[mask]
+            gated_data = np.compress(mask, data, axis=0)
             if full_output:
                 return Density2dGateOutput(
                     gated_data=gated_data,
@@ -521,9 +548,10 @@ def density2d(data,
         svH = vH[sidx]  # linearized counts array sorted by density
 
         # Find minimum number of accepted bins needed to reach specified
-        # number of events
+        # number of events. Since ``csvH`` is nondecreasing, the first index
+        # at which it reaches `n` can be found with a binary search.
         csvH = np.cumsum(svH)
-        Nidx = np.nonzero(csvH >= n)[0][0]    # we want to include this index
+        Nidx = np.searchsorted(csvH, n, side='left')  # include this index
 
         # Get indices of accepted histogram bins
         accepted_bin_indices = sidx[:(Nidx+1)]
@@ -562,17 +590,12 @@ def density2d(data,
                                             yc)]).T
                         for contour_ij in contours_ij]
 
-    accepted_data_indices = H_events[bin_mask]
-    accepted_data_indices = np.array([item       # flatten list of lists
-                                      for sublist in accepted_data_indices
-                                      for item in sublist],
-                                     dtype=int)
-
-    # Convert list of accepted data indices to boolean mask array
+    # Accept events belonging to accepted histogram bins, by looking up the
+    # bin of every (non-outlier) event in the bin mask.
     mask = np.zeros(shape=data.shape[0], dtype=bool)
-    mask[accepted_data_indices] = True
+    mask[event_indices] = bin_mask[x_bin_indices, y_bin_indices]
 
-    gated_data = data[mask]
+    gated_data = np.compress(mask, data, axis=0)
 
     if full_output:
         return Density2dGateOutput(gated_data=gated_data,
@@ -7,7 +7,12 @@ import os
 import copy
 import collections
 import datetime
+import mmap
+import multiprocessing
+import multiprocessing.pool
 import six
+import struct
+import threading
 import warnings
 
 import numpy as np
@@ -20,6 +25,20 @@ encoding = 'ISO-8859-1'
 # Utility functions for importing segments of FCS files
 ###
 
+# Output namedtuple returned by read_fcs_header_segment
+FCSHeader = collections.namedtuple(
+    typename='FCSHeader',
+    field_names=('version',
+                 'text_begin',
+                 'text_end',
+                 'data_begin',
+                 'data_end',
+                 'analysis_begin',
+                 'analysis_end'))
+
+# Layout of the HEADER segment, excluding offsets to OTHER segments
+_FCS_HEADER_STRUCT = struct.Struct('10s8s8s8s8s8s8s')
+
 def read_fcs_header_segment(buf, begin=0):
     """
     Read HEADER segment of FCS file.
@@ -44,6 +63,11 @@ def read_fcs_header_segment(buf, begin=0):
             - analysis_begin : int
             - analysis_end : int
 
+    Raises
+    ------
+    ValueError
+        If `buf` ends before the end of the HEADER segment.
+
     Notes
     -----
     Blank ANALYSIS segment offsets are converted to zeros.
@@ -67,31 +91,26 @@ def read_fcs_header_segment(buf, begin=0):
        19937951.
 
     """
-    fields = [
-        'version',
-        'text_begin',
-        'text_end',
-        'data_begin',
-        'data_end',
-        'analysis_begin',
-        'analysis_end']
-
-    FCSHeader = collections.namedtuple('FCSHeader', fields)
+    # Read all fields with a single call. The HEADER segment is composed of
+    # the version (10 bytes) followed by six offsets (8 bytes each).
+    buf.seek(begin)
+    raw = buf.read(_FCS_HEADER_STRUCT.size)
+    if len(raw) != _FCS_HEADER_STRUCT.size:
+        raise ValueError("HEADER segment should be"
+            + " {0} bytes long".format(_FCS_HEADER_STRUCT.size)
+            + " (detected {0} bytes)".format(len(raw)))
+    fields = _FCS_HEADER_STRUCT.unpack(raw)
 
     field_values = []
+    field_values.append(fields[0].decode(encoding).rstrip())    # version
 
-    buf.seek(begin)
-    field_values.append(buf.read(10).decode(encoding).rstrip()) # version
-
-    field_values.append(int(buf.read(8)))                       # text_begin
-    field_values.append(int(buf.read(8)))                       # text_end
-    field_values.append(int(buf.read(8)))                       # data_begin
-    field_values.append(int(buf.read(8)))                       # data_end
+    field_values.append(int(fields[1]))                         # text_begin
+    field_values.append(int(fields[2]))                         # text_end
+    field_values.append(int(fields[3]))                         # data_begin
+    field_values.append(int(fields[4]))                         # data_end
 
-    fv = buf.read(8).decode(encoding)                           # analysis_begin
-    field_values.append(0 if fv == ' '*8 else int(fv))
-    fv = buf.read(8).decode(encoding)                           # analysis_end
-    field_values.append(0 if fv == ' '*8 else int(fv))
+    for fv in fields[5:]:                           # analysis_begin and _end
+        field_values.append(0 if fv == b' '*8 else int(fv))
 
     header = FCSHeader._make(field_values)
     return header
@@ -168,13 +187,9 @@ def read_fcs_text_segment(buf, begin, end, delim=None, supplemental=False):
        19937951.
 
     """
-    if delim is None:
-        if supplemental:
-            raise ValueError("must specify ``delim`` if reading supplemental"
-                             + " TEXT segment")
-        else:
-            buf.seek(begin)
-            delim = buf.read(1).decode(encoding)
+    if delim is None and supplemental:
+        raise ValueError("must specify ``delim`` if reading supplemental"
+                         + " TEXT segment")
 
     # The offsets are inclusive (meaning they specify first and last byte
     # WITHIN segment) and seeking is inclusive (read() after seek() reads the
@@ -187,6 +202,10 @@ def read_fcs_text_segment(buf, begin, end, delim=None, supplemental=False):
     if not raw:
         return {}, None
 
+    # Extract delimiter from first character of primary TEXT segment
+    if delim is None:
+        delim = raw[0]
+
     if not supplemental:
         # Check that the first character of the TEXT segment is equal to the
         # delimiter.
@@ -211,6 +230,60 @@ def read_fcs_text_segment(buf, begin, end, delim=None, supplemental=False):
 
     pairs_list = raw.split(delim)
 
+    if (delim+delim) in raw or raw.endswith(delim):
+        # ``pairs_list`` contains empty elements other than the first one,
+        # indicating escaped delimiters which need to be reconstructed.
+        pairs_list_reconstructed = _reconstruct_escaped_delimiters(
+            pairs_list,
+            delim,
+            supplemental)
+    else:
+        # Without escaped delimiters, the only possible empty element is the
+        # one produced by a delimiter at the start of the segment.
+        if pairs_list[0] == '':
+            del pairs_list[0]
+        pairs_list_reconstructed = pairs_list
+
+    # List length should be even since all key-value entries should be pairs
+    if len(pairs_list_reconstructed) % 2 != 0:
+        raise ValueError("odd # of (keys + values); unpaired key or value")
+
+    # Build dictionary by consuming keys and values alternately from a single
+    # iterator, which avoids creating separate lists of keys and values.
+    pairs_iter = iter(pairs_list_reconstructed)
+    text = dict(zip(pairs_iter, pairs_iter))
+
+    return text, delim
+
+def _reconstruct_escaped_delimiters(pairs_list, delim, supplemental):
+    """
+    Reconstruct keys and values of a TEXT segment containing escaped
+    delimiters.
+
+    Parameters
+    ----------
+    pairs_list : list of str
+        Contents of TEXT segment split by `delim`, up to (and excluding)
+        the last delimiter.
+    delim : str
+        1-byte delimiter character of TEXT segment.
+    supplemental : bool
+        Flag specifying that segment is a supplemental TEXT segment.
+
+    Returns
+    -------
+    pairs_list_reconstructed : list of str
+        Alternating keys and values of TEXT segment.
+
+    Raises
+    ------
+    ValueError
+        If first keyword starts with delimiter.
+    ValueError
+        If TEXT segment is ill-formed (unable to be parsed according to the
+        FCS standards).
+
+    """
     ###
     # Reconstruct Keys and Values By Aggregating Escaped Delimiters
     ###
@@ -340,16 +413,127 @@ def read_fcs_text_segment(buf, begin, end, delim=None, supplemental=False):
             reconstructed_KV_accumulator.append(pairs_list[idx])
             idx = idx - 1
 
-    pairs_list_reconstructed = list(reversed(reconstructed_KV_accumulator))
+    return list(reversed(reconstructed_KV_accumulator))
 
-    # List length should be even since all key-value entries should be pairs
-    if len(pairs_list_reconstructed) % 2 != 0:
-        raise ValueError("odd # of (keys + values); unpaired key or value")
+def _map_data_segment(buf, dtype, begin, shape, willneed=False):
+    """
+    Map a region of a buffer to a copy-on-write numpy array.
 
-    text = dict(zip(pairs_list_reconstructed[0::2],
-                    pairs_list_reconstructed[1::2]))
+    Parameters
+    ----------
+    buf : file-like object or mmap
+        Buffer containing data to map. If `buf` is an mmap, it should be
+        created with ``access=mmap.ACCESS_COPY``. Otherwise, the region is
+        read into memory.
+    dtype : numpy dtype
+        Data type of the mapped array.
+    begin : int
+        Offset (in bytes) to first byte of region in `buf`.
+    shape : tuple
+        Shape of the mapped array.
+    willneed : bool, optional
+        Whether the whole region will be accessed right after mapping it.
+        If True and `buf` is an mmap, the operating system is advised to
+        start reading the region ahead of access. Otherwise, pages are
+        only read when accessed.
 
-    return text, delim
+    Returns
+    -------
+    data : numpy array
+        Array of shape `shape` with the contents of the region. Modifying
+        `data` does not modify `buf`.
+
+    Raises
+    ------
+    ValueError
+        If the region extends past the end of `buf` (e.g. if the file is
+        truncated), or if it cannot be read completely from `buf`.
+
+    """
+    # Check that the whole region is contained in `buf` before mapping it.
+    # Mapping past the end of a file may succeed (and fail later, when the
+    # missing data is accessed) or fail with a platform-dependent error.
+    num_bytes = np.dtype(dtype).itemsize*int(np.prod(shape))
+    buf.seek(0, os.SEEK_END)
+    buf_size = buf.tell()
+    if begin + num_bytes > buf_size:
+        raise ValueError("DATA segment extends past end of file (DATA"
+            + " segment end = {0} bytes,".format(begin + num_bytes)
+            + " file size = {0} bytes)".format(buf_size))
+
+    # If the whole region is about to be accessed, tell the operating system
+    # that it will be needed soon, so that it can start reading it ahead of
+    # access. Hints are only available on some platforms, and failing to
+    # apply them is harmless.
+    if (willneed and isinstance(buf, mmap.mmap)
+            and hasattr(mmap, 'MADV_WILLNEED')):
+        # Start of region to advise should be aligned to a page boundary
+        page_begin = begin - (begin % mmap.PAGESIZE)
+        try:
+            buf.madvise(mmap.MADV_WILLNEED,
+                        page_begin,
+                        num_bytes + (begin - page_begin))
+        except (EnvironmentError, ValueError):
+            pass
+
+    if isinstance(buf, mmap.mmap):
+        # Reuse the existing mapping instead of mapping the file again
+        count = int(np.prod(shape))
+        data = np.frombuffer(buf, dtype=dtype, count=count, offset=begin)
+        return data.reshape(shape)
+    else:
+        # `buf` could not be mapped (e.g. it is an in-memory buffer or a
+        # stream without a file descriptor). Read the region into a writeable
+        # array instead. Reading directly into the array avoids holding an
+        # intermediate copy of the region.
+        data = np.empty(shape, dtype=dtype)
+        buf.seek(begin)
+        if hasattr(buf, 'readinto'):
+            num_bytes_read = buf.readinto(data)
+        else:
+            raw = buf.read(num_bytes)
+            num_bytes_read = len(raw)
+            if num_bytes_read == num_bytes:
+                data[...] = np.frombuffer(raw, dtype=dtype).reshape(shape)
+        if num_bytes_read != num_bytes:
+            raise ValueError("could not read DATA segment (read"
+                + " {0} bytes, expected {1} bytes)".format(num_bytes_read,
+                                                           num_bytes))
+        return data
+
+def _get_param_bitmasks(param_ranges, dtype):
+    """
+    Get bit masks removing unused bits from each parameter.
+
+    Parameters
+    ----------
+    param_ranges : array-like or None
+        Array specifying parameter (aka channel) range for each parameter
+        (see $PnR keywords from FCS standards).
+    dtype : numpy dtype
+        Unsigned integer data type of the data to mask.
+
+    Returns
+    -------
+    bitmasks : list of int or None
+        Bit mask for each parameter, or None if `param_ranges` is None or
+        no bit mask would remove any bits of `dtype`.
+
+    """
+    if param_ranges is None:
+        return None
+
+    # bits_used should be related to resolution of cytometer ADC. Masks
+    # wider than `dtype` are clipped to its maximum value.
+    dtype_max = np.iinfo(dtype).max
+    bitmasks = []
+    for param_range in param_ranges:
+        bits_used = int(np.ceil(np.log2(param_range)))
+        bitmasks.append(min(~((~0) << bits_used), dtype_max))
+
+    if all(bitmask == dtype_max for bitmask in bitmasks):
+        return None
+    return bitmasks
 
 def read_fcs_data_segment(buf,
                           begin,
@@ -364,7 +548,7 @@ def read_fcs_data_segment(buf,
 
     Parameters
     ----------
-    buf : file-like object
+    buf : file-like object or mmap
         Buffer containing data to interpret as DATA segment.
     begin : int
         Offset (in bytes) to first byte of DATA segment in `buf`.
@@ -404,7 +588,12 @@ def read_fcs_data_segment(buf,
     -------
     data : numpy array
         NxD numpy array describing N cytometry events observing D data
-        dimensions.
+        dimensions. Data are always returned in the byte order native to
+        the user's machine. If `buf` is a copy-on-write mmap and the byte
+        order of the DATA segment is also native, `data` is a view of the
+        DATA segment in `buf`, such that events are read on demand;
+        otherwise, the DATA segment is read into memory. In both cases,
+        modifying `data` does not modify `buf`.
 
     Raises
     ------
@@ -414,6 +603,8 @@ def read_fcs_data_segment(buf,
         If calculated DATA segment size (as determined from the number
         of events, the number of parameters, and the number of bytes per
         data point) does not match size specified by `begin` and `end`.
+    ValueError
+        If DATA segment extends past the end of `buf`.
     ValueError
         If `param_bit_widths` doesn't agree with `datatype` for single
         precision or double precision floating point (i.e. they should
@@ -451,10 +642,8 @@ def read_fcs_data_segment(buf,
 
     if datatype == 'I':
         # Check if all parameters fit into preexisting data type
-        if (all(bw == 8  for bw in param_bit_widths) or
-            all(bw == 16 for bw in param_bit_widths) or
-            all(bw == 32 for bw in param_bit_widths) or
-            all(bw == 64 for bw in param_bit_widths)):
+        if (len(set(param_bit_widths)) == 1 and
+                param_bit_widths[0] in (8, 16, 32, 64)):
 
             num_bits = param_bit_widths[0]
 
@@ -464,26 +653,32 @@ def read_fcs_data_segment(buf,
             # points to the first byte of the next segment, in which case the #
             # of bytes specified in the header exceeds the # of bytes that we
             # should read by one.
-            if (shape[0]*shape[1]*(num_bits//8)) != ((end+1)-begin) and \
-                    (shape[0]*shape[1]*(num_bits//8)) != (end-begin):
+            num_bytes = shape[0]*shape[1]*(num_bits//8)
+            if num_bytes != ((end+1)-begin) and num_bytes != (end-begin):
                 raise ValueError("DATA size does not match expected array"
                     + " size (array size ="
-                    + " {0} bytes,".format(shape[0]*shape[1]*(num_bits//8))
+                    + " {0} bytes,".format(num_bytes)
                     + " DATA segment size = {0} bytes)".format((end+1)-begin))
 
             dtype = np.dtype('{0}u{1}'.format('>' if big_endian else '<',
                                               num_bits//8))
-            data = np.memmap(
+            # Map DATA segment copy-on-write. Pages are only read from disk
+            # when accessed, and writes (e.g. the bit masking below) modify a
+            # private copy of the affected pages instead of the file. The
+            # whole segment is only accessed right away if it needs to be
+            # byteswapped or masked.
+            bitmasks = _get_param_bitmasks(param_ranges, dtype)
+            data = _map_data_segment(
                 buf,
-                dtype=dtype,
-                mode='r',
-                offset=begin,
-                shape=shape,
-                order='C')
-
-            # Cast memmap object to regular numpy array stored in memory (as
-            # opposed to being backed by disk)
-            data = np.array(data)
+                dtype,
+                begin,
+                shape,
+                willneed=(not dtype.isnative or bitmasks is not None))
+
+            # Convert data to native byte order once, so that subsequent
+            # operations do not need to byteswap every element they access.
+            if not data.dtype.isnative:
+                data = np.asarray(data).astype(data.dtype.newbyteorder('='))
         else:
             # The FCS standards technically allows for parameters to NOT be
             # byte aligned, but parsing a DATA segment which is not byte
@@ -507,20 +702,19 @@ def read_fcs_data_segment(buf,
             # points to the first byte of the next segment, in which case the #
             # of bytes specified in the header exceeds the # of bytes that we
             # should read by one.
-            if (byte_shape[0]*byte_shape[1]) != ((end+1)-begin) and \
-                    (byte_shape[0]*byte_shape[1]) != (end-begin):
+            num_bytes = byte_shape[0]*byte_shape[1]
+            if num_bytes != ((end+1)-begin) and num_bytes != (end-begin):
                 raise ValueError("DATA size does not match expected array"
                     + " size (array size ="
-                    + " {0} bytes,".format(byte_shape[0]*byte_shape[1])
+                    + " {0} bytes,".format(num_bytes)
                     + " DATA segment size = {0} bytes)".format((end+1)-begin))
 
-            byte_data = np.memmap(
+            byte_data = _map_data_segment(
                 buf,
-                dtype='uint8',  # endianness doesn't matter for 1 byte
-                mode='r',
-                offset=begin,
-                shape=byte_shape,
-                order='C')
+                'uint8',    # endianness doesn't matter for 1 byte
+                begin,
+                byte_shape,
+                willneed=True)
 
             # Upcast all data to fit nearest supported data type of largest
             # bit width
@@ -553,20 +747,18 @@ def read_fcs_data_segment(buf,
                     else:
                         data[:,col] += byte_data[:,byte_data_col]
 
-        if param_ranges is not None:
-            # To strictly follow the FCS standards, mask off the unused high bits
-            # as specified by param_ranges.
-            for col in range(data.shape[1]):
-                # bits_used should be related to resolution of cytometer ADC
-                bits_used = int(np.ceil(np.log2(param_ranges[col])))
-
-                # Create a bit mask to mask off all but the lowest bits_used bits.
-                # bitmask is a native python int type which does not have an
-                # underlying size. The int type is effectively left-padded with
-                # 0s (infinitely), and the '&' operation preserves the dataype of
-                # the array, so this shouldn't be an issue.
-                bitmask = ~((~0) << bits_used)
-                data[:,col] &= bitmask
+        # To strictly follow the FCS standards, mask off the unused high bits
+        # as specified by param_ranges. Masks that keep every bit of the data
+        # type are no-ops, and are skipped entirely so that pages of a mapped
+        # DATA segment are not copied just to be rewritten with the same
+        # values.
+        bitmasks = _get_param_bitmasks(param_ranges, data.dtype)
+        if bitmasks is not None:
+            # Apply all masks in a single pass over the array by broadcasting
+            # one mask per column, instead of one strided pass per column.
+            np.bitwise_and(data,
+                           np.array(bitmasks, dtype=data.dtype),
+                           out=data)
 
     elif datatype in ('F','D'):
         num_bits = 32 if datatype == 'F' else 64
@@ -584,26 +776,25 @@ def read_fcs_data_segment(buf,
         # to the first byte of the next segment, in which case the # of bytes
         # specified in the header exceeds the # of bytes that we should read by
         # one.
-        if (shape[0]*shape[1]*(num_bits//8)) != ((end+1)-begin) and \
-            (shape[0]*shape[1]*(num_bits//8)) != (end-begin):
+        num_bytes = shape[0]*shape[1]*(num_bits//8)
+        if num_bytes != ((end+1)-begin) and num_bytes != (end-begin):
             raise ValueError("DATA size does not match expected array size"
-                + " (array size = {0}".format(shape[0]*shape[1]*(num_bits//8))
+                + " (array size = {0}".format(num_bytes)
                 + " bytes, DATA segment size ="
                 + " {0} bytes)".format((end+1)-begin))
 
         dtype = np.dtype('{0}f{1}'.format('>' if big_endian else '<',
                                           num_bits//8))
-        data = np.memmap(
-            buf,
-            dtype=dtype,
-            mode='r',
-            offset=begin,
-            shape=shape,
-            order='C')
-
-        # Cast memmap object to regular numpy array stored in memory (as
-        # opposed to being backed by disk)
-        data = np.array(data)
+        # Map DATA segment copy-on-write (see above)
+        data = _map_data_segment(buf,
+                                 dtype,
+                                 begin,
+                                 shape,
+                                 willneed=not dtype.isnative)
+
+        # Convert data to native byte order (see above)
+        if not data.dtype.isnative:
+            data = np.asarray(data).astype(data.dtype.newbyteorder('='))
     elif datatype == 'A':
         raise NotImplementedError("only \'I\' (unsigned binary integer),"
             + " \'F\' (single precision floating point), and \'D\' (double"
@@ -615,6 +806,166 @@ def read_fcs_data_segment(buf,
 
     return data
 
+def _read_fcs_header_text_segments(buf):
+    """
+    Read HEADER segment, primary TEXT segment, and optional supplemental
+    TEXT segment of FCS file.
+
+    Parameters
+    ----------
+    buf : file-like object or mmap
+        Buffer containing FCS file.
+
+    Returns
+    -------
+    header : namedtuple
+        Version information and byte offset values of other FCS segments,
+        as returned by `read_fcs_header_segment`.
+    text : dict
+        Dictionary of key-value entries from primary TEXT segment and
+        optional supplemental TEXT segment.
+    delim : str or None
+        Delimiter of TEXT segment, or None if TEXT segment is empty.
+
+    """
+    header = read_fcs_header_segment(buf=buf)
+
+    # Import primary TEXT segment and optional supplemental TEXT segment.
+    # Primary TEXT segment offsets are always specified in the HEADER
+    # segment. For FCS3.0 and above, supplemental TEXT segment offsets
+    # are always specified via required key-value pairs in the primary
+    # TEXT segment.
+    text, delim = read_fcs_text_segment(
+        buf=buf,
+        begin=header.text_begin,
+        end=header.text_end,
+        supplemental=False)
+
+    if header.version in ('FCS3.0','FCS3.1'):
+        stext_begin = int(text['$BEGINSTEXT'])   # required keyword
+        stext_end = int(text['$ENDSTEXT'])       # required keyword
+        if stext_begin and stext_end:
+            stext = read_fcs_text_segment(
+                buf=buf,
+                begin=stext_begin,
+                end=stext_end,
+                delim=delim,
+                supplemental=True)[0]
+            text.update(stext)
+
+    return header, text, delim
+
+def _map_file(f):
+    """
+    Map a whole file copy-on-write, if possible.
+
+    Parameters
+    ----------
+    f : file-like object
+        File to map.
+
+    Returns
+    -------
+    mmap or None
+        Copy-on-write mapping of the whole file, or None if `f` does not
+        have a file descriptor or cannot be mapped (e.g. empty files,
+        pipes, or compressed streams). The mapping remains valid after `f`
+        is closed.
+
+    """
+    try:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (AttributeError, ValueError, EnvironmentError):
+        return None
+
+    # Some file-like objects (e.g. ``gzip.GzipFile``) expose the file
+    # descriptor of an underlying file whose contents differ from what is
+    # read through the object. Only use the mapping if it matches the size
+    # of `f`.
+    try:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+    except (AttributeError, ValueError, EnvironmentError):
+        size = None
+    if size != len(mapping):
+        mapping.close()
+        return None
+
+    return mapping
+
+def _get_file_key(path, f):
+    """
+    Get a key identifying the current version of a file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    f : file object
+        Open file object of the file.
+
+    Returns
+    -------
+    key : tuple
+        Key identifying the file and its current version. The key changes
+        if the file is modified.
+
+    """
+    st = os.fstat(f.fileno())
+    mtime = getattr(st, 'st_mtime_ns', st.st_mtime)
+    return (os.path.abspath(path), st.st_dev, st.st_ino, mtime, st.st_size)
+
+class _LRUCache(object):
+    """
+    Thread-safe, least recently used cache with a maximum size.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of items in the cache. When full, the least recently
+        used item is discarded.
+
+    """
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get item from cache, or None if `key` is not in the cache.
+
+        """
+        with self._lock:
+            if key not in self._items:
+                return None
+            # Move item to the end of the ordered dictionary
+            value = self._items.pop(key)
+            self._items[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Add item to cache.
+
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            if len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all items from cache.
+
+        """
+        with self._lock:
+            self._items.clear()
+
+# Cache of HEADER and TEXT segments of previously imported FCS files
+_header_text_cache = _LRUCache(maxsize=256)
+
 ###
 # Classes
 ###
@@ -733,35 +1084,44 @@ class FCSFile(object):
 
         self._infile = infile
 
+        # Map the whole file once. All segments are read from the same
+        # mapping, which also backs the DATA segment array. The mapping
+        # remains valid after the file is closed, so files opened here are
+        # closed as soon as they are mapped.
+        #
+        # Each import creates its own mapping, even if the same file is
+        # already mapped by another object. The mapping is copy-on-write so
+        # that FCSData objects can be modified, and sharing it would make
+        # modifications to one object visible in the others. Pages that are
+        # not modified are still shared between mappings through the
+        # operating system's page cache.
+        #
+        # HEADER and TEXT segments are imported from a cache if the same
+        # file has been imported before and has not been modified since.
         if isinstance(infile, six.string_types):
-            f = open(infile, 'rb')
+            fd = open(infile, 'rb')
+            try:
+                file_key = _get_file_key(infile, fd)
+                f = _map_file(fd)
+                if f is None:
+                    # File cannot be mapped. Read it into memory instead.
+                    f = six.BytesIO(fd.read())
+            finally:
+                fd.close()
+            segments = _header_text_cache.get(file_key)
+            if segments is None:
+                segments = _read_fcs_header_text_segments(f)
+                _header_text_cache.set(file_key, segments)
         else:
-            f = infile
-
-        self._header = read_fcs_header_segment(buf=f)
-
-        # Import primary TEXT segment and optional supplemental TEXT segment.
-        # Primary TEXT segment offsets are always specified in the HEADER
-        # segment. For FCS3.0 and above, supplemental TEXT segment offsets
-        # are always specified via required key-value pairs in the primary
-        # TEXT segment.
-        self._text, delim = read_fcs_text_segment(
-            buf=f,
-            begin=self._header.text_begin,
-            end=self._header.text_end,
-            supplemental=False)
-
-        if self._header.version in ('FCS3.0','FCS3.1'):
-            stext_begin = int(self._text['$BEGINSTEXT'])   # required keyword
-            stext_end = int(self._text['$ENDSTEXT'])       # required keyword
-            if stext_begin and stext_end:
-                stext = read_fcs_text_segment(
-                    buf=f,
-                    begin=stext_begin,
-                    end=stext_end,
-                    delim=delim,
-                    supplemental=True)[0]
-                self._text.update(stext)
+            # Map file-like objects backed by a file too. Objects that cannot
+            # be mapped (e.g. in-memory buffers) are read from directly.
+            f = _map_file(infile)
+            if f is None:
+                f = infile
+            segments = _read_fcs_header_text_segments(f)
+        self._header, text, delim = segments
+        # Cached dictionaries are shared between imports, so keep a copy.
+        self._text = dict(text)
 
         # Confirm FCS file assumptions. All queried keywords are required
         # keywords.
@@ -867,9 +1227,6 @@ class FCSFile(object):
             raise ValueError("DATA segment incorrectly specified")
         self._data.flags.writeable = False
 
-        if isinstance(infile, six.string_types):
-            f.close()
-
     # Expose attributes as read-only properties
     @property
     def infile(self):
@@ -947,6 +1304,21 @@ class FCSFile(object):
     def __repr__(self):
         return str(self.infile)
 
+# Nonstandard keyword parameters used by some acquisition software to store
+# channel-dependent information. Each standard keyword parameter format maps
+# to a tuple containing a substring of the CREATOR keyword value identifying
+# the software, the format of the nonstandard keyword parameter, and the offset
+# added to the channel number to obtain the nonstandard keyword parameter.
+#   - The CellQuest Pro software saves the detector voltage in keyword
+#     parameters BD$WORD13, BD$WORD14, BD$WORD15... for channels 1, 2, 3...
+#   - The FlowJo Collector's Edition version 7.5.110.7 software saves the
+#     amplifier gain in keyword parameters CytekP01G, CytekP02G, CytekP03G, ...
+#     for channels 1, 2, 3, ...
+_NONSTANDARD_CHANNEL_KEYWORDS = {
+    '$P{}V': ('CellQuest Pro', 'BD$WORD{}', 12),
+    '$P{}G': ('FlowJoCollectorsEdition', 'CytekP{:02d}G', 0),
+}
+
 _FCSDataPickleState = collections.namedtuple(
     typename='_FCSDataPickleState',
     field_names=['infile',
@@ -1701,51 +2073,12 @@ class FCSData(np.ndarray):
         resolution = tuple(resolution)
 
         # Detector voltage: Stored in the keyword parameter $PnV for channel n.
-        detector_voltage = []
-        for i in range(1, num_channels + 1):
-            channel_detector_voltage = fcs_file.text.get('$P{}V'.format(i))
-
-            # The CellQuest Pro software saves the detector voltage in keyword
-            # parameters BD$WORD13, BD$WORD14, BD$WORD15... for channels 1, 2,
-            # 3...
-            if channel_detector_voltage is None and 'CREATOR' in fcs_file.text \
-                   and 'CellQuest Pro' in fcs_file.text.get('CREATOR'):
-                channel_detector_voltage = fcs_file.text.get('BD$WORD{}' \
-                                                             .format(12+i))
-
-            # Attempt to cast extracted value to float
-            # The FCS3.1 standard restricts $PnV to be a floating-point value
-            # only. Any value that cannot be casted will be replaced with None.
-            if channel_detector_voltage is not None:
-                try:
-                    channel_detector_voltage = float(channel_detector_voltage)
-                except ValueError:
-                    channel_detector_voltage = None
-            detector_voltage.append(channel_detector_voltage)
-        detector_voltage = tuple(detector_voltage)
+        detector_voltage = cls._parse_channel_floats(
+            fcs_file.text, '$P{}V', num_channels)
 
         # Amplifier gain: Stored in the keyword parameter $PnG for channel n.
-        amplifier_gain = []
-        for i in range(1, num_channels + 1):
-            channel_amp_gain = fcs_file.text.get('$P{}G'.format(i))
-
-            # The FlowJo Collector's Edition version 7.5.110.7 software saves
-            # the amplifier gain in keyword parameters CytekP01G, CytekP02G,
-            # CytekP03G, ... for channels 1, 2, 3, ...
-            if channel_amp_gain is None and 'CREATOR' in fcs_file.text and \
-                    'FlowJoCollectorsEdition' in fcs_file.text.get('CREATOR'):
-                channel_amp_gain = fcs_file.text.get('CytekP{:02d}G'.format(i))
-
-            # Attempt to cast extracted value to float
-            # The FCS3.1 standard restricts $PnG to be a floating-point value
-            # only. Any value that cannot be casted will be replaced with None.
-            if channel_amp_gain is not None:
-                try:
-                    channel_amp_gain = float(channel_amp_gain)
-                except ValueError:
-                    channel_amp_gain = None
-            amplifier_gain.append(channel_amp_gain)
-        amplifier_gain = tuple(amplifier_gain)
+        amplifier_gain = cls._parse_channel_floats(
+            fcs_file.text, '$P{}G', num_channels)
 
         # Channel label: Stored in the keyword parameter $PnS for channel n.
         channel_labels = []
@@ -1797,33 +2130,37 @@ class FCSData(np.ndarray):
         if hasattr(obj, '_analysis'):
             self._analysis = copy.deepcopy(obj._analysis)
 
+        # Channel-independent and channel-dependent attributes are immutable
+        # (strings, numbers, dates, or tuples thereof), so they are shared
+        # with the parent instead of copied. `_range` is the exception: it is
+        # a list modified in place by transformation functions, so it is
+        # copied.
+
         # Channel-independent attributes
         if hasattr(obj, '_data_type'):
-            self._data_type = copy.deepcopy(obj._data_type)
+            self._data_type = obj._data_type
         if hasattr(obj, '_time_step'):
-            self._time_step = copy.deepcopy(obj._time_step)
+            self._time_step = obj._time_step
         if hasattr(obj, '_acquisition_start_time'):
-            self._acquisition_start_time = copy.deepcopy(
-                obj._acquisition_start_time)
+            self._acquisition_start_time = obj._acquisition_start_time
         if hasattr(obj, '_acquisition_end_time'):
-            self._acquisition_end_time = copy.deepcopy(
-                obj._acquisition_end_time)
+            self._acquisition_end_time = obj._acquisition_end_time
 
         # Channel-dependent attributes
         if hasattr(obj, '_channels'):
-            self._channels = copy.deepcopy(obj._channels)
+            self._channels = obj._channels
         if hasattr(obj, '_amplification_type'):
-            self._amplification_type = copy.deepcopy(obj._amplification_type)
+            self._amplification_type = obj._amplification_type
         if hasattr(obj, '_detector_voltage'):
-            self._detector_voltage = copy.deepcopy(obj._detector_voltage)
+            self._detector_voltage = obj._detector_voltage
         if hasattr(obj, '_amplifier_gain'):
-            self._amplifier_gain = copy.deepcopy(obj._amplifier_gain)
+            self._amplifier_gain = obj._amplifier_gain
         if hasattr(obj, '_channel_labels'):
-            self._channel_labels = copy.deepcopy(obj._channel_labels)
+            self._channel_labels = obj._channel_labels
         if hasattr(obj, '_range'):
             self._range = copy.deepcopy(obj._range)
         if hasattr(obj, '_resolution'):
-            self._resolution = copy.deepcopy(obj._resolution)
+            self._resolution = obj._resolution
 
     def __reduce__(self):
         """
@@ -1940,6 +2277,64 @@ class FCSData(np.ndarray):
         self._resolution             = fcsdata_state.resolution
 
     # Helper functions
+    @staticmethod
+    def _parse_channel_floats(text, keyword, num_channels):
+        """
+        Get floating-point values of a channel-dependent keyword parameter.
+
+        If the keyword parameter is not present for a channel, and the FCS
+        file was created by software known to store the same information in
+        a nonstandard keyword parameter (see
+        ``_NONSTANDARD_CHANNEL_KEYWORDS``), the nonstandard keyword
+        parameter is used instead.
+
+        Parameters:
+        -----------
+        text : dict
+            Dictionary of key-value entries from the TEXT segment.
+        keyword : str
+            Format string of the keyword parameter, with a placeholder for
+            the channel number (e.g. '$P{}V').
+        num_channels : int
+            Number of channels.
+
+        Returns:
+        --------
+        values : tuple
+            Value of the keyword parameter for each channel, cast to float.
+            Values that are missing or that cannot be cast to float are
+            returned as None.
+
+        """
+        # Determine whether a nonstandard keyword parameter should be used as
+        # a fallback. This only depends on the software that created the file,
+        # so it is checked once for all channels.
+        fallback_keyword = None
+        if keyword in _NONSTANDARD_CHANNEL_KEYWORDS and 'CREATOR' in text:
+            creator, nonstandard_keyword, offset = \
+                _NONSTANDARD_CHANNEL_KEYWORDS[keyword]
+            if creator in text['CREATOR']:
+                fallback_keyword = nonstandard_keyword
+
+        values = []
+        for i in range(1, num_channels + 1):
+            value = text.get(keyword.format(i))
+            if value is None and fallback_keyword is not None:
+                value = text.get(fallback_keyword.format(offset + i))
+
+            # Attempt to cast extracted value to float
+            # The FCS3.1 standard restricts $PnV and $PnG to be floating-point
+            # values only. Any value that cannot be casted will be replaced
+            # with None.
+            if value is not None:
+                try:
+                    value = float(value)
+                except ValueError:
+                    value = None
+            values.append(value)
+
+        return tuple(values)
+
     @staticmethod
     def _parse_time_string(time_str):
         """
@@ -2246,3 +2641,49 @@ class FCSData(np.ndarray):
 
         """
         return os.path.basename(str(self.infile))
+
+###
+# Functions for loading multiple FCS files
+###
+
+def load_fcs_files(infiles, num_threads=None):
+    """
+    Load multiple FCS files concurrently.
+
+    Parameters
+    ----------
+    infiles : list of str or file-like
+        References to the FCS files to load.
+    num_threads : int, optional
+        Number of threads used to load files. If None, use the number of
+        CPUs in the system.
+
+    Returns
+    -------
+    list of FCSData
+        FCSData objects, in the same order as `infiles`.
+
+    Notes
+    -----
+    Files are loaded by a pool of threads rather than processes. Most of
+    the time spent loading an FCS file is spent by numpy reading and
+    converting the DATA segment, which does not hold the Global
+    Interpreter Lock. In addition, loaded DATA segments do not need to be
+    copied between processes, and memory mapped DATA segments remain
+    backed by the files themselves.
+
+    """
+    infiles = list(infiles)
+    if num_threads is None:
+        num_threads = multiprocessing.cpu_count()
+    num_threads = max(1, min(num_threads, len(infiles)))
+
+    if num_threads == 1:
+        return [FCSData(infile) for infile in infiles]
+
+    pool = multiprocessing.pool.ThreadPool(num_threads)
+    try:
+        return pool.map(FCSData, infiles)
+    finally:
+        pool.close()
+        pool.join()
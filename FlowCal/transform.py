@@ -49,8 +49,9 @@ def transform(data, channels, transform_fxn, def_channels = None):
         NxD transformed flow cytometry data.
 
     """
-    # Copy data array
-    data_t = data.copy().astype(np.float64)
+    # Copy data array. ``astype`` always returns a new array, so the data
+    # are copied and converted to float64 in a single pass.
+    data_t = data.astype(np.float64)
 
     # Default
     if channels is None:
@@ -201,7 +202,7 @@ def to_rfi(data,
         channels = channels
 
     # Copy data array
-    data_t = data.copy().astype(np.float64)
+    data_t = data.astype(np.float64)
 
     # Iterate over channels
     for channel, r, at, ag in \
@@ -322,7 +323,7 @@ def to_mef(data, channels, sc_list, sc_channels = None):
             raise ValueError("no standard curve for channel {}".format(chs))
 
     # Copy data array
-    data_t = data.copy().astype(np.float64)
+    data_t = data.astype(np.float64)
 
     # Iterate over channels
     for chi, sc in zip(sc_channels, sc_list):
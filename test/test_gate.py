@@ -528,7 +528,52 @@ class TestHighLowGate(unittest.TestCase):
                                   full_output=True).mask,
             np.array([1,1,1,1,1,1,1,1,1,1], dtype=bool)
             )
-        
+
+    ###
+    # Test length-1 high and low values, which apply to all channels
+    ###
+
+    def test_2d_length_1_high_low_mask(self):
+        np.testing.assert_array_equal(
+            FlowCal.gate.high_low(self.d2,
+                                  high=[9],
+                                  low=[1],
+                                  full_output=True).mask,
+            np.array([0,1,0,0,0,1,1,0,0,0], dtype=bool)
+            )
+
+    def test_2d_row_vector_high_low_mask(self):
+        np.testing.assert_array_equal(
+            FlowCal.gate.high_low(self.d2,
+                                  high=np.array([[9, 10, 10]]),
+                                  low=np.array([[1, 1, 1]]),
+                                  full_output=True).mask,
+            np.array([0,1,1,0,0,1,1,1,0,0], dtype=bool)
+            )
+
+    def test_2d_wrong_length_high_raises(self):
+        self.assertRaises(ValueError,
+                          FlowCal.gate.high_low,
+                          self.d2,
+                          high=[8, 8])
+
+    ###
+    # Test data larger than the block size used internally by the gate
+    ###
+
+    def test_large_data_mask(self):
+        np.random.seed(0)
+        d = np.random.randint(0, 1024, size=(20000,3))
+        high = np.array([1000, 900, 800])
+        low = np.array([10, 20, 30])
+        np.testing.assert_array_equal(
+            FlowCal.gate.high_low(d,
+                                  high=high,
+                                  low=low,
+                                  full_output=True).mask,
+            np.all((d < high) & (d > low), axis=1)
+            )
+
 class TestDensity2dGate1(unittest.TestCase):
     
     def setUp(self):
@@ -5,7 +5,9 @@ Unit tests for the `io` module.
 
 import datetime
 import os
+import shutil
 import six
+import tempfile
 import unittest
 import warnings
 try:
@@ -113,6 +115,15 @@ class TestFCSDataLoading(unittest.TestCase):
              'Time',
              ))
 
+    def test_loading_native_byte_order(self):
+        """
+        Testing that data is loaded in native byte order.
+
+        """
+        for filename in filenames:
+            d = FlowCal.io.FCSData(filename)
+            self.assertTrue(d.dtype.isnative)
+
 class TestReadTextSegment(unittest.TestCase):
     """
     Test that TEXT segments are parsed correctly.
@@ -1514,6 +1525,56 @@ class TestReadTextSegment(unittest.TestCase):
             buf=buf, begin=0, end=len(raw_text_segment)-1, delim=delim,
                 supplemental=True)
 
+class TestReadDataSegment(unittest.TestCase):
+    """
+    Test that DATA segments are parsed correctly.
+
+    """
+    def setUp(self):
+        self.data = np.array([[0xFFFF, 0x0FFF, 0x03FF],
+                              [0x1234, 0x5678, 0x9ABC]], dtype='>u2')
+        self.buf = six.BytesIO(self.data.tobytes())
+
+    def read_data(self, param_ranges):
+        return FlowCal.io.read_fcs_data_segment(
+            buf=self.buf,
+            begin=0,
+            end=self.data.nbytes - 1,
+            datatype='I',
+            num_events=self.data.shape[0],
+            param_bit_widths=[16, 16, 16],
+            big_endian=True,
+            param_ranges=param_ranges)
+
+    def test_param_ranges_mask(self):
+        """
+        Test that unused bits are masked off as specified by $PnR.
+
+        """
+        np.testing.assert_array_equal(
+            self.read_data(param_ranges=[65536, 1024, 256]),
+            np.array([[0xFFFF, 0x03FF, 0x00FF],
+                      [0x1234, 0x0278, 0x00BC]]))
+
+    def test_param_ranges_no_mask(self):
+        """
+        Test that data is unchanged if $PnR covers all bits.
+
+        """
+        np.testing.assert_array_equal(
+            self.read_data(param_ranges=[65536, 65536, 65536]),
+            self.data)
+
+    def test_param_ranges_wider_than_data_type(self):
+        """
+        Test that $PnR values wider than the data type don't mask any bits.
+
+        """
+        np.testing.assert_array_equal(
+            self.read_data(param_ranges=[262144, 2**40, 1024]),
+            np.array([[0xFFFF, 0x0FFF, 0x03FF],
+                      [0x1234, 0x5678, 0x02BC]]))
+
 class TestFCSParseTimeString(unittest.TestCase):
     def test_parse_none(self):
         """
@@ -2987,5 +3048,220 @@ class TestFCSDataPickle(unittest.TestCase):
     def tearDown(self):
         os.remove(self.test_file)
 
+class TestFCSDataLittleEndian(unittest.TestCase):
+    """
+    Test loading of FCS files stored in little endian byte order.
+
+    On little endian machines, the DATA segment of these files is used
+    directly from the copy-on-write mapping of the file.
+
+    """
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        # Test files with integer (Data001.fcs) and floating-point
+        # (Data004.fcs) data, both stored in big endian byte order.
+        self.filenames = [filenames[0], filenames[3]]
+        self.le_filenames = []
+        for filename in self.filenames:
+            fcs_file = FlowCal.io.FCSFile(filename)
+            header = fcs_file.header
+            text = fcs_file.text
+            with open(filename, 'rb') as f:
+                contents = bytearray(f.read())
+
+            # Byte order in TEXT segment. Both values have the same length,
+            # so offsets to other segments are not affected.
+            text_segment = bytes(contents[header.text_begin:header.text_end+1])
+            text_segment = text_segment.replace(six.b('4,3,2,1'),
+                                                six.b('1,2,3,4'))
+            contents[header.text_begin:header.text_end+1] = text_segment
+
+            # Byte order of DATA segment
+            data_begin = header.data_begin or int(text['$BEGINDATA'])
+            num_bytes = fcs_file.data.size*fcs_file.data.dtype.itemsize
+            data = np.frombuffer(
+                bytes(contents[data_begin:data_begin+num_bytes]),
+                dtype=fcs_file.data.dtype.newbyteorder('>'))
+            contents[data_begin:data_begin+num_bytes] = \
+                data.astype(data.dtype.newbyteorder('<')).tobytes()
+
+            le_filename = os.path.join(self.tmpdir,
+                                       os.path.basename(filename))
+            with open(le_filename, 'wb') as f:
+                f.write(contents)
+            self.le_filenames.append(le_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_data(self):
+        """
+        Testing that data matches data loaded from big endian files.
+
+        """
+        for filename, le_filename in zip(self.filenames, self.le_filenames):
+            d = FlowCal.io.FCSData(filename)
+            d_le = FlowCal.io.FCSData(le_filename)
+            self.assertEqual(d_le.text['$BYTEORD'], '1,2,3,4')
+            self.assertTrue(d_le.dtype.isnative)
+            np.testing.assert_array_equal(d_le, d)
+
+    def test_write_does_not_modify_file(self):
+        """
+        Testing that writing to FCSData does not modify the file.
+
+        """
+        for filename, le_filename in zip(self.filenames, self.le_filenames):
+            with open(le_filename, 'rb') as f:
+                contents = f.read()
+            d = FlowCal.io.FCSData(filename)
+            d_le = FlowCal.io.FCSData(le_filename)
+            d_le[:] = 0
+            with open(le_filename, 'rb') as f:
+                self.assertEqual(f.read(), contents)
+            np.testing.assert_array_equal(FlowCal.io.FCSData(le_filename), d)
+
+class TestFCSFileTruncated(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'Data001.fcs')
+        with open(filenames[0], 'rb') as f:
+            contents = f.read()
+        # Remove the last 100 bytes of the DATA segment
+        with open(self.filename, 'wb') as f:
+            f.write(contents[:-100])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_truncated_file(self):
+        """
+        Testing that loading a truncated FCS file raises ValueError.
+
+        """
+        self.assertRaises(ValueError, FlowCal.io.FCSData, self.filename)
+
+    def test_truncated_file_object(self):
+        """
+        Testing that loading a truncated FCS file object raises ValueError.
+
+        """
+        with open(self.filename, 'rb') as f:
+            self.assertRaises(ValueError, FlowCal.io.FCSData, f)
+
+    def test_truncated_header(self):
+        """
+        Testing that reading a truncated HEADER segment raises ValueError.
+
+        """
+        with open(filenames[0], 'rb') as f:
+            buf = six.BytesIO(f.read(50))
+        self.assertRaises(ValueError,
+                          FlowCal.io.read_fcs_header_segment,
+                          buf)
+        self.assertRaises(ValueError, FlowCal.io.FCSData, buf)
+
+class TestFCSFileObject(unittest.TestCase):
+    def setUp(self):
+        self.d = [FlowCal.io.FCSData(filename) for filename in filenames]
+
+    def test_file_object(self):
+        """
+        Testing that loading from a file object matches loading from a path.
+
+        """
+        for filename, d in zip(filenames, self.d):
+            with open(filename, 'rb') as f:
+                d_f = FlowCal.io.FCSData(f)
+            np.testing.assert_array_equal(d_f, d)
+            self.assertEqual(d_f.text, d.text)
+
+    def test_in_memory_buffer(self):
+        """
+        Testing that loading from an in-memory buffer matches loading from
+        a path.
+
+        """
+        for filename, d in zip(filenames, self.d):
+            with open(filename, 'rb') as f:
+                buf = six.BytesIO(f.read())
+            d_buf = FlowCal.io.FCSData(buf)
+            np.testing.assert_array_equal(d_buf, d)
+            self.assertEqual(d_buf.text, d.text)
+
+class TestFCSFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'Data001.fcs')
+        shutil.copyfile(filenames[0], self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_text_modified(self):
+        """
+        Testing that modifying the returned TEXT segment has no effect on
+        subsequent imports.
+
+        """
+        d = FlowCal.io.FCSData(self.filename)
+        d.text['$P1N'] = 'test'
+        d = FlowCal.io.FCSData(self.filename)
+        self.assertEqual(d.text['$P1N'], 'FSC-H')
+        self.assertEqual(d.channels[0], 'FSC-H')
+
+    def test_file_modified(self):
+        """
+        Testing that a modified file is imported again.
+
+        """
+        d = FlowCal.io.FCSData(self.filename)
+        self.assertEqual(d.channels[0], 'FSC-H')
+        # Release the file, which cannot be written while mapped on Windows
+        del d
+
+        # Rename first channel, keeping the size of the TEXT segment
+        with open(self.filename, 'rb') as f:
+            contents = f.read()
+        contents = contents.replace(six.b('FSC-H'), six.b('FSC-X'), 1)
+        with open(self.filename, 'wb') as f:
+            f.write(contents)
+        # Ensure modification time changes regardless of its resolution
+        st = os.stat(self.filename)
+        os.utime(self.filename, (st.st_atime, st.st_mtime + 10))
+
+        d = FlowCal.io.FCSData(self.filename)
+        self.assertEqual(d.channels[0], 'FSC-X')
+
+class TestLoadFCSFiles(unittest.TestCase):
+    def test_load_fcs_files(self):
+        """
+        Testing that loading multiple files is equivalent to loading each.
+
+        """
+        d_list = FlowCal.io.load_fcs_files(filenames, num_threads=2)
+        self.assertEqual(len(d_list), len(filenames))
+        for d, filename in zip(d_list, filenames):
+            d_ref = FlowCal.io.FCSData(filename)
+            self.assertIsInstance(d, FlowCal.io.FCSData)
+            self.assertEqual(d.infile, filename)
+            self.assertEqual(d.channels, d_ref.channels)
+            np.testing.assert_array_equal(d, d_ref)
+
+    def test_load_fcs_files_single_thread(self):
+        """
+        Testing loading multiple files with one thread.
+
+        """
+        d_list = FlowCal.io.load_fcs_files(filenames, num_threads=1)
+        self.assertEqual([d.infile for d in d_list], filenames)
+
+    def test_load_fcs_files_empty(self):
+        """
+        Testing loading an empty list of files.
+
+        """
+        self.assertEqual(FlowCal.io.load_fcs_files([]), [])
+
 if __name__ == '__main__':
     unittest.main()